@@ -1,3 +1,3 @@
-from .bedbaseconfig import BedBaseConfig
+from .bedbaseconfig import BedBaseConfig, clear_config_cache
 
-__all__ = ["BedBaseConfig"]
+__all__ = ["BedBaseConfig", "clear_config_cache"]
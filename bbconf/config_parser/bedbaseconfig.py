@@ -1,22 +1,30 @@
+import json
 import logging
 import os
+import posixpath
+import re
+import tempfile
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Literal, Union
+from typing import TYPE_CHECKING, Iterator, List, Literal, Tuple, Union
 
 import boto3
-import qdrant_client
-import yacman
-from botocore.exceptions import EndpointConnectionError
-
-from geniml.search import QdrantBackend, BED2BEDSearchInterface, Text2BEDSearchInterface
-from geniml.search.query2vec import BED2Vec, Text2Vec
-from geniml.region2vec import Region2VecExModel
+import yaml
+from boto3.s3.transfer import S3Transfer, TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError, EndpointConnectionError
 
 from pephubclient import PEPHubClient
+from pydantic import ValidationError
 
 from bbconf.config_parser.const import (
+    CONFIG_CACHE_SUFFIX,
+    CONFIG_VERSION_HEADER,
     S3_BEDSET_PATH_FOLDER,
+    S3_DELETE_BATCH_SIZE,
     S3_FILE_PATH_FOLDER,
     S3_PLOTS_PATH_FOLDER,
 )
@@ -30,14 +38,306 @@ from bbconf.exceptions import (
     BedBaseConfError,
     BedbaseS3ConnectionError,
 )
-from bbconf.helpers import get_absolute_path, get_bedbase_cfg
+from bbconf.helpers import get_absolute_path, get_bedbase_cfg, get_set_fields
 from bbconf.models.base_models import FileModel
 from bbconf.models.bed_models import BedFiles, BedPlots
 from bbconf.models.bedset_models import BedSetPlots
 from bbconf.models.drs_models import AccessMethod, AccessURL
 
+# geniml and qdrant pull in torch and other heavy dependencies,
+# so they are imported only when search objects are created
+if TYPE_CHECKING:
+    from geniml.region2vec import Region2VecExModel
+    from geniml.search import (
+        BED2BEDSearchInterface,
+        QdrantBackend,
+        Text2BEDSearchInterface,
+    )
+
 _LOGGER = logging.getLogger(PKG_NAME)
 
+_CONFIG_SECTIONS = tuple(ConfigFile.model_fields)
+
+
+def _build_default_sections() -> dict:
+    """
+    Build default objects of config sections, that have no required fields
+
+    :return: dict of section name and default section object
+    """
+    default_sections = {}
+    for section, field in ConfigFile.model_fields.items():
+        try:
+            default_sections[section] = field.annotation()
+        except ValidationError:
+            # sections with required fields (e.g. database) have no defaults
+            pass
+    return default_sections
+
+
+# built once, so missing sections are not validated again on every config read
+_DEFAULT_SECTIONS = _build_default_sections()
+
+# init error messages, that were already emitted as warnings
+_WARNED_INIT_ERRORS = set()
+
+# marks lazily created objects, that were not initialized yet. None means that
+# initialization failed, and is cached, so it is not retried on every access
+_UNSET = object()
+
+# lazily created objects, that are reset to _UNSET after unpickling
+_LAZY_ATTRIBUTES = ("_qdrant_engine", "_t2bsi", "_b2bsi", "_r2v")
+
+# attributes holding connections, locks or models, which are not pickled
+_UNPICKLABLE_ATTRIBUTES = (
+    "_lazy_init_lock",
+    "_db_engine",
+    "_qdrant_engine",
+    "_t2bsi",
+    "_b2bsi",
+    "_r2v",
+    "_phc",
+    "_boto3_client",
+    "_s3_transfer",
+    "_upload_executor",
+)
+
+_S3_FOLDER_BY_TYPE = {
+    "files": S3_FILE_PATH_FOLDER,
+    "plots": S3_PLOTS_PATH_FOLDER,
+    "bedsets": S3_BEDSET_PATH_FOLDER,
+}
+
+# boto3 session is expensive to create (loads service models), and is shared
+# by all BedBaseConfig instances. Session is not thread safe, hence the lock.
+_BOTO3_SESSION = None
+_BOTO3_SESSION_LOCK = threading.Lock()
+
+# region2vec models by model path. Loading a model takes seconds and hundreds
+# of MB of memory, so it is loaded once per process and shared by all configs
+_R2V_MODELS = {}
+_R2V_MODELS_LOCK = threading.Lock()
+
+try:
+    _YAMLLoader = yaml.CSafeLoader
+except AttributeError:  # PyYAML built without libyaml
+    _YAMLLoader = yaml.SafeLoader
+
+# $VAR and ${VAR} references, as expanded by os.path.expandvars
+_ENV_VAR_PATTERN = re.compile(r"\$(\w+)|\$\{([^}]+)\}")
+
+
+def _expand_env(value):
+    """
+    Recursively expand environment variables and user home in config values
+
+    :param value: parsed config value (dict, list or scalar)
+    :return: value with expanded strings
+    """
+    if isinstance(value, dict):
+        return {k: _expand_env(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_expand_env(v) for v in value]
+    if isinstance(value, str):
+        return os.path.expandvars(os.path.expanduser(value))
+    return value
+
+
+def _iter_strings(value) -> Iterator[str]:
+    """
+    Recursively iterate over all strings in config values
+
+    :param value: parsed config value (dict, list or scalar)
+    :return: iterator of strings
+    """
+    if isinstance(value, dict):
+        for v in value.values():
+            yield from _iter_strings(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _iter_strings(v)
+    elif isinstance(value, str):
+        yield value
+
+
+def _env_key(config: dict) -> Tuple[Tuple[str, Union[str, None]], ...]:
+    """
+    Get current values of environment variables referenced in the configuration
+
+    Used as a part of the parsed configuration cache key, so that configuration
+    is expanded again when any of the referenced variables changes.
+
+    :param config: parsed, not expanded configuration
+    :return: sorted tuple of (variable name, value) pairs
+    """
+    names = set()
+    for value in _iter_strings(config):
+        if value.startswith("~"):
+            names.add("HOME")
+        names.update(a or b for a, b in _ENV_VAR_PATTERN.findall(value))
+    return tuple((name, os.environ.get(name)) for name in sorted(names))
+
+
+def _config_cache_key(config_path: str) -> Union[str, List[int]]:
+    """
+    Get key identifying the current content of the configuration file
+
+    If the first line of the file is a content version header
+    (e.g. '# content-version: <md5>'), the version is used as a key,
+    otherwise modification time and size of the file are used.
+
+    :param config_path: configuration file path
+    :return: cache key
+    """
+    with open(config_path, "r") as f:
+        first_line = f.readline().strip()
+    if first_line.startswith(CONFIG_VERSION_HEADER):
+        return first_line[len(CONFIG_VERSION_HEADER) :].strip()
+    stat = os.stat(config_path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_config_cache(
+    config_path: str, cache_key: Union[str, List[int]]
+) -> Union[dict, None]:
+    """
+    Read parsed configuration from the JSON sidecar file, if it is up to date
+
+    :param config_path: configuration file path
+    :param cache_key: key of the current content of the configuration file
+    :return: parsed configuration or None if cache is missing or stale
+    """
+    try:
+        with open(config_path + CONFIG_CACHE_SUFFIX, "r") as f:
+            cache = json.load(f)
+        if cache["key"] == cache_key:
+            return cache["data"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _write_config_cache(
+    config_path: str, cache_key: Union[str, List[int]], data: dict
+) -> None:
+    """
+    Atomically write parsed configuration to the JSON sidecar file
+
+    Failures are not fatal, e.g. when config directory is read-only.
+
+    :param config_path: configuration file path
+    :param cache_key: key of the configuration file content, computed before it was read,
+        so that a file changed during parsing is not cached under the new key
+    :param data: parsed configuration
+    :return: None
+    """
+    cache_path = config_path + CONFIG_CACHE_SUFFIX
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(cache_path)), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"key": cache_key, "data": data}, f)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except (OSError, TypeError, ValueError) as e:
+        _LOGGER.debug(f"Could not write config cache file {cache_path}: {e}")
+
+
+@lru_cache(maxsize=16)
+def _load_config_cached(config_path: str, mtime: int, size: int) -> dict:
+    """
+    Load configuration file, without expanding environment variables
+
+    Loaded configuration is cached in a JSON sidecar file ('<config>.cache.json'),
+    that is reused until the configuration file is changed.
+    Modification time and size are part of the lru_cache key only.
+    Returned dict is shared between calls and must not be modified.
+
+    :param config_path: absolute configuration file path
+    :param mtime: modification time of the file [ns]
+    :param size: size of the file
+    :return: loaded configuration
+    """
+    cache_key = _config_cache_key(config_path)
+    _config = _read_config_cache(config_path, cache_key)
+    if _config is None:
+        with open(config_path, "r") as f:
+            _config = yaml.load(f, Loader=_YAMLLoader) or {}
+        _write_config_cache(config_path, cache_key, _config)
+    return _config
+
+
+@lru_cache(maxsize=16)
+def _parse_config_cached(
+    config_path: str,
+    mtime: int,
+    size: int,
+    env: Tuple[Tuple[str, Union[str, None]], ...],
+) -> ConfigFile:
+    """
+    Parse configuration file and insert default values if not set
+
+    :param config_path: absolute configuration file path
+    :param mtime: modification time of the file [ns]
+    :param size: size of the file
+    :param env: values of environment variables referenced in the file.
+        Part of the lru_cache key only, see _env_key
+    :return: configuration object
+    """
+    # env variables are expanded after caching, so they are not written to disk
+    _config = _expand_env(_load_config_cached(config_path, mtime, size))
+
+    # missing sections are filled with prebuilt section defaults in one validation pass
+    return ConfigFile.model_validate(
+        {
+            section: _config.get(section) or _DEFAULT_SECTIONS.get(section, {})
+            for section in _CONFIG_SECTIONS
+        }
+    )
+
+
+def clear_config_cache() -> None:
+    """
+    Clear in-memory cache of parsed configuration files
+
+    :return: None
+    """
+    _load_config_cached.cache_clear()
+    _parse_config_cached.cache_clear()
+
+
+def _report_init_error(message: str, err: Exception) -> None:
+    """
+    Log error of client/object initialization.
+    Warning is emitted only once per message, e.g. not on every qdrant reconnect.
+
+    :param message: error message
+    :param err: raised exception
+    :return: None
+    """
+    _LOGGER.error("%s Error: %s", message, err)
+    if message not in _WARNED_INIT_ERRORS:
+        _WARNED_INIT_ERRORS.add(message)
+        warnings.warn(f"{message} Error: {err}", UserWarning, stacklevel=3)
+
+
+def _get_file_size(file_path: str) -> int:
+    """
+    Get size of the local file, using single stat call
+
+    :param file_path: local path to the file
+    :return: size of the file in bytes
+    :raises BedBaseConfError: if file does not exist
+    """
+    try:
+        return os.stat(file_path).st_size
+    except FileNotFoundError:
+        raise BedBaseConfError(f"File {file_path} does not exist.")
+
 
 class BedBaseConfig:
     def __init__(self, config: Union[Path, str]):
@@ -45,36 +345,67 @@ class BedBaseConfig:
         self._config = self._read_config_file(self.cfg_path)
 
         self._db_engine = self._init_db_engine()
-        self._qdrant_engine = self._init_qdrant_backend()
-        self._t2bsi = self._init_t2bsi_object()
-        self._b2bsi = self._init_b2bsi_object()
-        self._r2v = self._init_r2v_object()
+
+        # qdrant engine, search interfaces and region2vec model are heavy,
+        # so they are created on first use
+        self._lazy_init_lock = threading.RLock()
+        self._qdrant_engine = _UNSET
+        self._t2bsi = _UNSET
+        self._b2bsi = _UNSET
+        self._r2v = _UNSET
+        self._upload_executor = None
 
         self._phc = self._init_pephubclient()
         self._boto3_client = self._init_boto3_client()
+        self._s3_transfer = self._init_s3_transfer()
+
+    def __getstate__(self) -> dict:
+        """
+        Get picklable state of the object (e.g. to send it to ProcessPoolExecutor workers).
+        Live clients and engines are dropped, and recreated after unpickling.
+
+        :return: object state
+        """
+        state = self.__dict__.copy()
+        for attr_name in _UNPICKLABLE_ATTRIBUTES:
+            state[attr_name] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore object from pickled state, and recreate clients.
+        Qdrant engine, search interfaces and region2vec model are recreated on first use.
+
+        :param state: object state
+        :return: None
+        """
+        self.__dict__.update(state)
+        self._lazy_init_lock = threading.RLock()
+        for attr_name in _LAZY_ATTRIBUTES:
+            setattr(self, attr_name, _UNSET)
+        self._db_engine = self._init_db_engine()
+        self._phc = self._init_pephubclient()
+        self._boto3_client = self._init_boto3_client()
+        self._s3_transfer = self._init_s3_transfer()
 
     @staticmethod
     def _read_config_file(config_path: str) -> ConfigFile:
         """
         Read configuration file and insert default values if not set
 
+        Parsed configuration is cached in memory until the file or any environment
+        variable it references is changed, so repeated initialization is cheap.
+
         :param config_path: configuration file path
         :return: None
         :raises: raise_missing_key (if config key is missing)
         """
-        _config = yacman.YAMLConfigManager(filepath=config_path).exp
-
-        config_dict = {}
-        for field_name, annotation in ConfigFile.model_fields.items():
-            try:
-                config_dict[field_name] = annotation.annotation(
-                    **_config.get(field_name)
-                )
-            except TypeError:
-                # TODO: this should be more specific
-                config_dict[field_name] = annotation.annotation()
-
-        return ConfigFile(**config_dict)
+        config_path = os.path.abspath(config_path)
+        stat = os.stat(config_path)
+        raw_config = _load_config_cached(config_path, stat.st_mtime_ns, stat.st_size)
+        return _parse_config_cached(
+            config_path, stat.st_mtime_ns, stat.st_size, _env_key(raw_config)
+        ).model_copy(deep=True)
 
     @property
     def config(self) -> ConfigFile:
@@ -95,39 +426,77 @@ class BedBaseConfig:
         return self._db_engine
 
     @property
-    def t2bsi(self) -> Union[Text2BEDSearchInterface, None]:
+    def t2bsi(self) -> Union["Text2BEDSearchInterface", None]:
         """
-        Get text2bednn object
+        Get text2bednn object. Created on first access; if creation fails, None is returned
+        and creation is not retried.
 
         :return: text2bednn object
         """
+        if self._t2bsi is _UNSET:
+            with self._lazy_init_lock:
+                if self._t2bsi is _UNSET:
+                    self._t2bsi = self._init_t2bsi_object()
         return self._t2bsi
 
     @property
-    def b2bsi(self) -> Union[BED2BEDSearchInterface, None]:
+    def b2bsi(self) -> Union["BED2BEDSearchInterface", None]:
         """
-        Get bed2bednn object
+        Get bed2bednn object. Created on first access; if creation fails, None is returned
+        and creation is not retried.
 
         :return: bed2bednn object
         """
+        if self._b2bsi is _UNSET:
+            with self._lazy_init_lock:
+                if self._b2bsi is _UNSET:
+                    self._b2bsi = self._init_b2bsi_object()
         return self._b2bsi
 
     @property
-    def r2v(self) -> Region2VecExModel:
+    def r2v(self) -> "Region2VecExModel":
         """
         Get region2vec object
 
         :return: region2vec object
         """
+        if self._r2v is _UNSET:
+            with self._lazy_init_lock:
+                if self._r2v is _UNSET:
+                    self._r2v = self._init_r2v_object()
         return self._r2v
 
     @property
-    def qdrant_engine(self) -> QdrantBackend:
+    def upload_executor(self) -> ThreadPoolExecutor:
+        """
+        Get thread pool, shared by all s3 uploads of this config
+
+        :return: thread pool executor
         """
-        Get qdrant engine
+        if self._upload_executor is None:
+            with self._lazy_init_lock:
+                if self._upload_executor is None:
+                    # each worker blocks on one upload of the shared transfer manager,
+                    # which runs at most max_concurrency transfer threads. More workers
+                    # would only wait for transfer threads
+                    self._upload_executor = ThreadPoolExecutor(
+                        max_workers=max(1, self._config.s3.max_concurrency),
+                        thread_name_prefix="bbconf-s3-upload",
+                    )
+        return self._upload_executor
+
+    @property
+    def qdrant_engine(self) -> "QdrantBackend":
+        """
+        Get qdrant engine. Created on first access; if connection fails, None is returned
+        and connection is not retried.
 
         :return: qdrant engine
         """
+        if self._qdrant_engine is _UNSET:
+            with self._lazy_init_lock:
+                if self._qdrant_engine is _UNSET:
+                    self._qdrant_engine = self._init_qdrant_backend()
         return self._qdrant_engine
 
     @property
@@ -156,14 +525,21 @@ class BedBaseConfig:
             user=self._config.database.user,
             password=self._config.database.password,
             drivername=f"{self._config.database.dialect}+{self._config.database.driver}",
+            pool_size=self._config.database.pool_size,
+            max_overflow=self._config.database.max_overflow,
+            pool_pre_ping=self._config.database.pool_pre_ping,
+            pool_recycle=self._config.database.pool_recycle,
         )
 
-    def _init_qdrant_backend(self) -> QdrantBackend:
+    def _init_qdrant_backend(self) -> "QdrantBackend":
         """
         Create qdrant client object using credentials provided in config file
 
         :return: QdrantClient
         """
+        import qdrant_client
+        from geniml.search import QdrantBackend
+
         try:
             return QdrantBackend(
                 collection=self._config.qdrant.collection,
@@ -172,17 +548,17 @@ class BedBaseConfig:
                 qdrant_api_key=self._config.qdrant.api_key,
             )
         except qdrant_client.http.exceptions.ResponseHandlingException as err:
-            _LOGGER.error(f"error in Connection to qdrant! skipping... Error: {err}")
-            warnings.warn(
-                f"error in Connection to qdrant! skipping... Error: {err}", UserWarning
-            )
+            _report_init_error("error in Connection to qdrant! skipping...", err)
+            return None
 
-    def _init_t2bsi_object(self) -> Union[Text2BEDSearchInterface, None]:
+    def _init_t2bsi_object(self) -> Union["Text2BEDSearchInterface", None]:
         """
         Create Text 2 BED search interface and return this object
 
         :return: Text2BEDSearchInterface object
         """
+        from geniml.search import Text2BEDSearchInterface
+        from geniml.search.query2vec import Text2Vec
 
         try:
             return Text2BEDSearchInterface(
@@ -193,30 +569,25 @@ class BedBaseConfig:
                 ),
             )
         except Exception as e:
-            _LOGGER.error("Error in creating Text2BEDSearchInterface object: " + str(e))
-            warnings.warn(
-                "Error in creating Text2BEDSearchInterface object: " + str(e),
-                UserWarning,
-            )
+            _report_init_error("Error in creating Text2BEDSearchInterface object.", e)
             return None
 
-    def _init_b2bsi_object(self) -> Union[BED2BEDSearchInterface, None]:
+    def _init_b2bsi_object(self) -> Union["BED2BEDSearchInterface", None]:
         """
         Create Bed 2 BED search interface and return this object
 
         :return: Bed2BEDSearchInterface object
         """
+        from geniml.search import BED2BEDSearchInterface
+        from geniml.search.query2vec import BED2Vec
+
         try:
             return BED2BEDSearchInterface(
                 backend=self.qdrant_engine,
                 query2vec=BED2Vec(model=self._config.path.region2vec),
             )
         except Exception as e:
-            _LOGGER.error("Error in creating BED2BEDSearchInterface object: " + str(e))
-            warnings.warn(
-                "Error in creating BED2BEDSearchInterface object: " + str(e),
-                UserWarning,
-            )
+            _report_init_error("Error in creating BED2BEDSearchInterface object.", e)
             return None
 
     @staticmethod
@@ -229,42 +600,81 @@ class BedBaseConfig:
         try:
             return PEPHubClient()
         except Exception as e:
-            _LOGGER.error(f"Error in creating PephubClient object: {e}")
-            warnings.warn(f"Error in creating PephubClient object: {e}", UserWarning)
+            _report_init_error("Error in creating PephubClient object.", e)
             return None
 
     def _init_boto3_client(
         self,
     ) -> boto3.client:
         """
-        Create Pephub client object using credentials provided in config file
+        Create boto3 s3 client object using credentials provided in config file
 
-        :return: PephubClient
+        :return: boto3 s3 client
         """
+        global _BOTO3_SESSION
         try:
-            return boto3.client(
-                "s3",
-                endpoint_url=self._config.s3.endpoint_url,
-                aws_access_key_id=self._config.s3.aws_access_key_id,
-                aws_secret_access_key=self._config.s3.aws_secret_access_key,
-            )
+            with _BOTO3_SESSION_LOCK:
+                if _BOTO3_SESSION is None:
+                    _BOTO3_SESSION = boto3.session.Session()
+                return _BOTO3_SESSION.client(
+                    "s3",
+                    endpoint_url=self._config.s3.endpoint_url,
+                    aws_access_key_id=self._config.s3.aws_access_key_id,
+                    aws_secret_access_key=self._config.s3.aws_secret_access_key,
+                    config=Config(
+                        max_pool_connections=self._config.s3.max_pool_connections,
+                        retries={
+                            "mode": "standard",
+                            "max_attempts": self._config.s3.max_attempts,
+                        },
+                        tcp_keepalive=True,
+                    ),
+                )
         except Exception as e:
-            _LOGGER.error(f"Error in creating boto3 client object: {e}")
-            warnings.warn(f"Error in creating boto3 client object: {e}", UserWarning)
+            _report_init_error("Error in creating boto3 client object.", e)
             return None
 
-    def _init_r2v_object(self) -> Region2VecExModel:
+    def _init_s3_transfer(self) -> Union[S3Transfer, None]:
         """
-        Create Region2VecExModel object using credentials provided in config file
+        Create s3 transfer manager, that uploads big files in parallel multipart chunks
+
+        :return: S3Transfer object or None if s3 client was not created
         """
-        return Region2VecExModel(self.config.path.region2vec)
+        if not self._boto3_client:
+            return None
+        return S3Transfer(
+            self._boto3_client,
+            TransferConfig(
+                multipart_threshold=self._config.s3.multipart_threshold,
+                multipart_chunksize=self._config.s3.multipart_chunksize,
+                max_concurrency=self._config.s3.max_concurrency,
+                use_threads=True,
+            ),
+        )
 
-    def upload_s3(self, file_path: str, s3_path: Union[Path, str]) -> None:
+    def _init_r2v_object(self) -> "Region2VecExModel":
+        """
+        Create Region2VecExModel object using credentials provided in config file.
+        Model is loaded once per process and reused by all configs with the same model path.
+        """
+        from geniml.region2vec import Region2VecExModel
+
+        model_path = self.config.path.region2vec
+        with _R2V_MODELS_LOCK:
+            if model_path not in _R2V_MODELS:
+                _R2V_MODELS[model_path] = Region2VecExModel(model_path)
+            return _R2V_MODELS[model_path]
+
+    def upload_s3(
+        self, file_path: str, s3_path: Union[Path, str], check_exists: bool = True
+    ) -> None:
         """
         Upload file to s3.
 
         :param file_path: local path to the file
         :param s3_path: path to the file in s3 with file name
+        :param check_exists: check that local file exists before upload. Can be disabled,
+            if it was already checked by the caller
         :return: None
         """
         if not self._boto3_client:
@@ -274,10 +684,10 @@ class BedBaseConfig:
             raise BedbaseS3ConnectionError(
                 "Could not upload file to s3. Connection error."
             )
-        if not os.path.exists(file_path):
+        if check_exists and not os.path.exists(file_path):
             raise BedBaseConfError(f"File {file_path} does not exist.")
         _LOGGER.info(f"Uploading file to s3: {s3_path}")
-        return self._boto3_client.upload_file(file_path, self.config.s3.bucket, s3_path)
+        return self._s3_transfer.upload_file(file_path, self.config.s3.bucket, s3_path)
 
     def upload_files_s3(
         self,
@@ -285,6 +695,7 @@ class BedBaseConfig:
         files: Union[BedFiles, BedPlots, BedSetPlots],
         base_path: str,
         type: Literal["files", "plots", "bedsets"] = "files",
+        parallel: bool = True,
     ) -> Union[BedFiles, BedPlots, BedSetPlots]:
         """
         Upload files to s3.
@@ -293,47 +704,65 @@ class BedBaseConfig:
         :param files: dictionary with files to upload
         :param base_path: local path to the output files
         :param type: type of files to upload [files, plots, bedsets]
+        :param parallel: upload files concurrently, using one shared s3 client
         :return: None
         """
 
-        if type == "files":
-            s3_output_base_folder = S3_FILE_PATH_FOLDER
-        elif type == "plots":
-            s3_output_base_folder = S3_PLOTS_PATH_FOLDER
-        elif type == "bedsets":
-            s3_output_base_folder = S3_BEDSET_PATH_FOLDER
-        else:
+        try:
+            s3_output_base_folder = _S3_FOLDER_BY_TYPE[type]
+        except KeyError:
             raise BedBaseConfError(
                 f"Invalid type: {type}. Should be 'files', 'plots', or 'bedsets'"
             )
-
-        for key, value in files:
-            if not value:
-                continue
+        files_to_upload = get_set_fields(files)
+        if not files_to_upload:
+            return files
+
+        # s3 keys always use '/' as a separator, regardless of the local OS
+        s3_output_folder = f"{s3_output_base_folder}/{identifier[0]}/{identifier[1]}"
+
+        # (local path, s3 path) of all files and thumbnails to upload. Existence of all
+        # local files is checked before the first upload, so uploads skip the check
+        upload_tasks = []
+        uploaded_files = []
+        for key, value in files_to_upload:
             file_base_name = os.path.basename(value.path)
             file_path = get_absolute_path(value.path, base_path)
-            s3_path = os.path.join(
-                s3_output_base_folder,
-                identifier[0],
-                identifier[1],
-                file_base_name,
-            )
-            self.upload_s3(file_path, s3_path=s3_path)
-
-            setattr(value, "name", key)
-            setattr(value, "size", os.path.getsize(file_path))
-            setattr(value, "path", s3_path)
+            s3_path = f"{s3_output_folder}/{file_base_name}"
+            file_size = _get_file_size(file_path)
+            upload_tasks.append((file_path, s3_path))
 
+            s3_path_thumbnail = None
             if value.path_thumbnail:
                 file_base_name_thumbnail = os.path.basename(value.path_thumbnail)
                 file_path_thumbnail = get_absolute_path(value.path_thumbnail, base_path)
-                s3_path_thumbnail = os.path.join(
-                    s3_output_base_folder,
-                    identifier[0],
-                    identifier[1],
-                    file_base_name_thumbnail,
+                s3_path_thumbnail = f"{s3_output_folder}/{file_base_name_thumbnail}"
+                if not os.path.exists(file_path_thumbnail):
+                    raise BedBaseConfError(
+                        f"File {file_path_thumbnail} does not exist."
+                    )
+                upload_tasks.append((file_path_thumbnail, s3_path_thumbnail))
+
+            uploaded_files.append((key, value, file_size, s3_path, s3_path_thumbnail))
+
+        if parallel and len(upload_tasks) > 1:
+            futures = [
+                self.upload_executor.submit(
+                    self.upload_s3, file_path, s3_path=s3_path, check_exists=False
                 )
-                self.upload_s3(file_path_thumbnail, s3_path=s3_path_thumbnail)
+                for file_path, s3_path in upload_tasks
+            ]
+            for future in futures:
+                future.result()
+        else:
+            for file_path, s3_path in upload_tasks:
+                self.upload_s3(file_path, s3_path=s3_path, check_exists=False)
+
+        for key, value, file_size, s3_path, s3_path_thumbnail in uploaded_files:
+            setattr(value, "name", key)
+            setattr(value, "size", file_size)
+            setattr(value, "path", s3_path)
+            if s3_path_thumbnail:
                 setattr(value, "path_thumbnail", s3_path_thumbnail)
 
         return files
@@ -362,6 +791,52 @@ class BedBaseConfig:
                 "Could not delete file from s3. Connection error."
             )
 
+    def delete_s3_batch(self, s3_paths: List[str]) -> None:
+        """
+        Delete multiple files from s3, using one request per 1000 files.
+
+        If batch request fails, or some files were not deleted,
+        these files are deleted one by one.
+
+        :param s3_paths: list of paths to the files in s3
+        :return: None
+        """
+        if not s3_paths:
+            return None
+        if not self._boto3_client:
+            _LOGGER.warning(
+                "Could not delete files from s3. Connection to s3 not established. Skipping.."
+            )
+            raise BedbaseS3ConnectionError(
+                "Could not delete file from s3. Connection error."
+            )
+        for start in range(0, len(s3_paths), S3_DELETE_BATCH_SIZE):
+            batch = s3_paths[start : start + S3_DELETE_BATCH_SIZE]
+            _LOGGER.info(f"Deleting {len(batch)} files from s3")
+            try:
+                response = self._boto3_client.delete_objects(
+                    Bucket=self.config.s3.bucket,
+                    Delete={
+                        "Objects": [{"Key": s3_path} for s3_path in batch],
+                        "Quiet": True,
+                    },
+                )
+            except EndpointConnectionError:
+                raise BedbaseS3ConnectionError(
+                    "Could not delete file from s3. Connection error."
+                )
+            except ClientError as e:
+                _LOGGER.warning(
+                    f"Batch delete from s3 failed, deleting files one by one. Error: {e}"
+                )
+                failed_paths = batch
+            else:
+                failed_paths = [error["Key"] for error in response.get("Errors", [])]
+
+            for s3_path in failed_paths:
+                self.delete_s3(s3_path)
+        return None
+
     def delete_files_s3(self, files: List[FileModel]) -> None:
         """
         Delete files from s3.
@@ -369,10 +844,9 @@ class BedBaseConfig:
         :param files: list of file objects
         :return: None
         """
-        for file in files:
-            self.delete_s3(file.path)
-            if file.path_thumbnail:
-                self.delete_s3(file.path_thumbnail)
+        s3_paths = [file.path for file in files]
+        s3_paths.extend(file.path_thumbnail for file in files if file.path_thumbnail)
+        self.delete_s3_batch(s3_paths)
         return None
 
     def get_prefixed_uri(self, postfix: str, access_id: str) -> str:
@@ -386,7 +860,8 @@ class BedBaseConfig:
 
         try:
             prefix = getattr(self.config.access_methods, access_id).prefix
-            return os.path.join(prefix, postfix)
+            # uri always uses '/' as a separator, regardless of the local OS
+            return posixpath.join(prefix, postfix)
         except KeyError:
             _LOGGER.error(f"Access method {access_id} is not defined.")
             raise BadAccessMethodError(f"Access method {access_id} is not defined.")
@@ -399,14 +874,17 @@ class BedBaseConfig:
         :return: list of access methods
         """
         access_methods = []
-        for access_id in self.config.access_methods.model_dump().keys():
+        # iterate config model directly, instead of dumping it for every access method
+        for access_id, access_method in self.config.access_methods:
+            if access_method is None:
+                continue
             access_dict = AccessMethod(
                 type=access_id,
                 access_id=access_id,
-                access_url=AccessURL(url=self.get_prefixed_uri(rel_path, access_id)),
-                region=self.config.access_methods.model_dump()[access_id].get(
-                    "region", None
+                access_url=AccessURL(
+                    url=posixpath.join(access_method.prefix, rel_path)
                 ),
+                region=getattr(access_method, "region", None),
             )
             access_methods.append(access_dict)
         return access_methods
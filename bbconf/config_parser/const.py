@@ -2,6 +2,10 @@ DEFAULT_DB_NAME = "bedbase"
 DEFAULT_DB_PORT = 5432
 DEFAULT_DB_DIALECT = "postgresql"
 DEFAULT_DB_DRIVER = "psycopg"
+DEFAULT_DB_POOL_SIZE = 10
+DEFAULT_DB_MAX_OVERFLOW = 20
+DEFAULT_DB_POOL_PRE_PING = True
+DEFAULT_DB_POOL_RECYCLE = 1800
 
 DEFAULT_QDRANT_HOST = "localhost"
 DEFAULT_QDRANT_PORT = 6333
@@ -20,8 +24,17 @@ DEFAULT_PEPHUB_NAME = "bedbase_all"
 DEFAULT_PEPHUB_TAG = "default"
 
 DEFAULT_S3_BUCKET = "bedbase"
+DEFAULT_S3_MAX_POOL_CONNECTIONS = 50
+DEFAULT_S3_MAX_ATTEMPTS = 3
+DEFAULT_S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+DEFAULT_S3_MULTIPART_CHUNKSIZE = 16 * 1024 * 1024
+DEFAULT_S3_MAX_CONCURRENCY = 16
 
 
 S3_FILE_PATH_FOLDER = "files"
 S3_PLOTS_PATH_FOLDER = "stats"
 S3_BEDSET_PATH_FOLDER = "bedsets"
+S3_DELETE_BATCH_SIZE = 1000
+
+CONFIG_CACHE_SUFFIX = ".cache.json"
+CONFIG_VERSION_HEADER = "# content-version:"
@@ -5,7 +5,11 @@ from pydantic import BaseModel, ConfigDict
 from bbconf.config_parser.const import (
     DEFAULT_DB_DIALECT,
     DEFAULT_DB_DRIVER,
+    DEFAULT_DB_MAX_OVERFLOW,
     DEFAULT_DB_NAME,
+    DEFAULT_DB_POOL_PRE_PING,
+    DEFAULT_DB_POOL_RECYCLE,
+    DEFAULT_DB_POOL_SIZE,
     DEFAULT_DB_PORT,
     DEFAULT_PEPHUB_NAME,
     DEFAULT_PEPHUB_NAMESPACE,
@@ -14,6 +18,11 @@ from bbconf.config_parser.const import (
     DEFAULT_QDRANT_PORT,
     DEFAULT_REGION2_VEC_MODEL,
     DEFAULT_S3_BUCKET,
+    DEFAULT_S3_MAX_ATTEMPTS,
+    DEFAULT_S3_MAX_CONCURRENCY,
+    DEFAULT_S3_MAX_POOL_CONNECTIONS,
+    DEFAULT_S3_MULTIPART_CHUNKSIZE,
+    DEFAULT_S3_MULTIPART_THRESHOLD,
     DEFAULT_SERVER_HOST,
     DEFAULT_SERVER_PORT,
     DEFAULT_TEXT2VEC_MODEL,
@@ -29,6 +38,10 @@ class ConfigDB(BaseModel):
     database: str = DEFAULT_DB_NAME
     dialect: str = DEFAULT_DB_DIALECT
     driver: Optional[str] = DEFAULT_DB_DRIVER
+    pool_size: int = DEFAULT_DB_POOL_SIZE
+    max_overflow: int = DEFAULT_DB_MAX_OVERFLOW
+    pool_pre_ping: bool = DEFAULT_DB_POOL_PRE_PING
+    pool_recycle: int = DEFAULT_DB_POOL_RECYCLE
 
     model_config = ConfigDict(extra="forbid")
 
@@ -68,6 +81,11 @@ class ConfigS3(BaseModel):
     aws_access_key_id: Union[str, None] = None
     aws_secret_access_key: Union[str, None] = None
     bucket: Union[str, None] = DEFAULT_S3_BUCKET
+    max_pool_connections: int = DEFAULT_S3_MAX_POOL_CONNECTIONS
+    max_attempts: int = DEFAULT_S3_MAX_ATTEMPTS
+    multipart_threshold: int = DEFAULT_S3_MULTIPART_THRESHOLD
+    multipart_chunksize: int = DEFAULT_S3_MULTIPART_CHUNKSIZE
+    max_concurrency: int = DEFAULT_S3_MAX_CONCURRENCY
 
 
 class ConfigPepHubClient(BaseModel):
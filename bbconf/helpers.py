@@ -1,6 +1,8 @@
 import logging
 import os
+from typing import Any, List, Tuple
 
+from pydantic import BaseModel
 from yacman import select_config
 
 from bbconf.exceptions import BedBaseConnectionError
@@ -43,3 +45,19 @@ def get_absolute_path(path: str, base_path: str) -> str:
     if not os.path.isabs(path) or not os.path.exists(path):
         return os.path.join(base_path, path)
     return path
+
+
+def get_set_fields(model: BaseModel) -> List[Tuple[str, Any]]:
+    """
+    Get names and values of the fields, that were set in the model and are not empty.
+    Files and plots models have many optional fields, but only few of them are set.
+
+    :param model: files or plots model
+    :return: list of (field name, value) tuples, sorted by field name
+    """
+    fields = []
+    for name in sorted(model.model_fields_set):
+        value = getattr(model, name)
+        if value:
+            fields.append((name, value))
+    return fields
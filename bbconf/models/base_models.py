@@ -15,7 +15,12 @@ class FileModel(BaseModel):
     object_id: Optional[str] = None
     access_methods: List[AccessMethod] = None
 
-    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+    model_config = ConfigDict(
+        populate_by_name=True,
+        extra="ignore",
+        frozen=False,
+        validate_assignment=False,
+    )
 
 
 class StatsReturn(BaseModel):
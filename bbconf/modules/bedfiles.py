@@ -1,24 +1,25 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from logging import getLogger
-from typing import Dict, Union
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple, Union
 
-import numpy as np
-from geniml.bbclient import BBClient
-from geniml.io import RegionSet
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
 from pephubclient.exceptions import ResponseError
-from qdrant_client.models import Distance, PointIdsList, VectorParams
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, joinedload, load_only, raiseload, selectinload
 
 from bbconf.config_parser.bedbaseconfig import BedBaseConfig
 from bbconf.const import (
     PKG_NAME,
 )
-from bbconf.db_utils import Bed, BedStats, Files
+from bbconf.db_utils import Bed, BedStats, Files, column_values
 from bbconf.exceptions import (
     BedBaseConfError,
     BedFIleExistsError,
     BEDFileNotFoundError,
 )
+from bbconf.helpers import get_set_fields
 from bbconf.models.bed_models import (
     BedClassification,
     BedFiles,
@@ -32,10 +33,129 @@ from bbconf.models.bed_models import (
     QdrantSearchResult,
 )
 
+# numpy, geniml and qdrant_client (geniml pulls in torch) are imported only
+# by methods that use them, so database and s3 access doesn't load them
+if TYPE_CHECKING:
+    import numpy as np
+    from geniml.io import RegionSet
+
 _LOGGER = getLogger(PKG_NAME)
 
 QDRANT_GENOME = "hg38"
 
+# number of vectors uploaded to qdrant in one request
+QDRANT_UPLOAD_BATCH_SIZE = 256
+
+# number of concurrent requests to pephub in get_many
+PEPHUB_MAX_WORKERS = 16
+
+BED_BUNDLE_FIELDS = ("stats", "plots", "files", "classification", "objects")
+
+# columns needed to build BedStatsModel and BedClassification
+_STATS_KEYS = tuple(
+    name for name in BedStatsModel.model_fields if hasattr(BedStats, name)
+)
+_CLASSIFICATION_KEYS = tuple(
+    name for name in BedClassification.model_fields if hasattr(Bed, name)
+)
+_STATS_COLUMNS = [getattr(BedStats, name) for name in _STATS_KEYS]
+_CLASSIFICATION_COLUMNS = [getattr(Bed, name) for name in _CLASSIFICATION_KEYS]
+
+_PLOT_FIELDS = frozenset(BedPlots.model_fields)
+_FILE_FIELDS = frozenset(BedFiles.model_fields)
+# file name -> kind of object; plots take precedence, as in the models
+_FILE_KIND = {
+    **{name: "file" for name in _FILE_FIELDS},
+    **{name: "plot" for name in _PLOT_FIELDS},
+}
+
+# pephub sample responses are cached for PEPHUB_CACHE_TTL seconds
+PEPHUB_CACHE_SIZE = 4096
+PEPHUB_CACHE_TTL = 300
+
+_PEPHUB_CACHE = TTLCache(maxsize=PEPHUB_CACHE_SIZE, ttl=PEPHUB_CACHE_TTL)
+_PEPHUB_CACHE_LOCK = threading.Lock()
+
+
+def _phc_cache_key(phc, namespace: str, name: str, tag: str, sample_name: str):
+    # pephub client is not part of the key, so entries can be invalidated by sample
+    return hashkey(namespace, name, tag, sample_name)
+
+
+@cached(_PEPHUB_CACHE, key=_phc_cache_key, lock=_PEPHUB_CACHE_LOCK)
+def _phc_sample_get(phc, namespace: str, name: str, tag: str, sample_name: str) -> dict:
+    """
+    Get sample from pephub. Responses are cached with TTL.
+
+    :param phc: pephub client
+    :param namespace: pephub namespace
+    :param name: pephub project name
+    :param tag: pephub project tag
+    :param sample_name: sample name (bed file identifier)
+    :return: sample dict
+    """
+    return phc.sample.get(
+        namespace=namespace,
+        name=name,
+        tag=tag,
+        sample_name=sample_name,
+    )
+
+
+def clear_pephub_cache() -> None:
+    """
+    Remove all cached pephub responses.
+    """
+    with _PEPHUB_CACHE_LOCK:
+        _PEPHUB_CACHE.clear()
+
+
+def _file_model(
+    file_object: Files, object_id: str = None, access_methods: list = None
+) -> FileModel:
+    """
+    Create FileModel from the database record, skipping validation.
+
+    :param file_object: file record from the database
+    :param object_id: object id of the file
+    :param access_methods: list of access methods of the file
+    :return: file model
+    """
+    return FileModel.model_construct(
+        name=file_object.name,
+        title=file_object.title,
+        path=file_object.path,
+        path_thumbnail=file_object.path_thumbnail,
+        description=file_object.description,
+        size=file_object.size,
+        object_id=object_id,
+        access_methods=access_methods,
+    )
+
+
+def _stats_model(stats_object: BedStats) -> BedStatsModel:
+    """
+    Create BedStatsModel from the database record, skipping validation.
+
+    :param stats_object: bed stats record from the database
+    :return: bed stats model
+    """
+    return BedStatsModel.model_construct(
+        **{key: getattr(stats_object, key) for key in _STATS_KEYS}
+    )
+
+
+def _classification_model(bed_object: Bed) -> BedClassification:
+    """
+    Create BedClassification from the database record, skipping validation.
+
+    :param bed_object: bed record from the database
+    :return: bed classification model
+    """
+    return BedClassification.model_construct(
+        **{key: getattr(bed_object, key) for key in _CLASSIFICATION_KEYS}
+    )
+
 
 class BedAgentBedFile:
     """
@@ -50,10 +170,126 @@ class BedAgentBedFile:
         """
         self._sa_engine = config.db_engine.engine
         self._db_engine = config.db_engine
-        self._qdrant_engine = config.qdrant_engine
         self._boto3_client = config.boto3_client
         self._config = config
 
+    def _load_bed(self, session: Session, identifier: str, *options) -> Bed:
+        """
+        Load bed file record from the database in one query.
+
+        :param session: sqlalchemy session
+        :param identifier: bed file identifier
+        :param options: loader options (e.g. relationships to load eagerly)
+        :return: bed file record
+        :raises BEDFileNotFoundError: if bed file doesn't exist
+        """
+        bed_object = session.get(Bed, identifier, options=options)
+        if not bed_object:
+            raise BEDFileNotFoundError(f"Bed file with id: {identifier} not found.")
+        return bed_object
+
+    def _get_plots_and_files(self, bed_object: Bed) -> Tuple[BedPlots, BedFiles]:
+        """
+        Split files of the loaded bed file record into plots and files.
+
+        :param bed_object: bed file record with loaded files
+        :return: bed file plots and files
+        """
+        bed_plots = BedPlots()
+        bed_files = BedFiles()
+        containers = {"plot": bed_plots, "file": bed_files}
+        for result in bed_object.files:
+            kind = _FILE_KIND.get(result.name)
+            if kind is None:
+                _LOGGER.error(
+                    f"Unknown file type: {result.name}. And is not in the model fields. Skipping.."
+                )
+                continue
+            setattr(
+                containers[kind],
+                result.name,
+                _file_model(
+                    result,
+                    object_id=f"bed.{bed_object.id}.{result.name}",
+                    access_methods=self._config.construct_access_method_list(
+                        result.path
+                    ),
+                ),
+            )
+        return bed_plots, bed_files
+
+    @staticmethod
+    def _get_objects(bed_object: Bed) -> Dict[str, FileModel]:
+        """
+        Get all objects of the loaded bed file record.
+
+        :param bed_object: bed file record with loaded files
+        :return: objects dict
+        """
+        return {result.name: _file_model(result) for result in bed_object.files}
+
+    def _get_phc_sample(self, identifier: str) -> dict:
+        """
+        Get sample of the bed file from configured pephub project (cached).
+
+        :param identifier: bed file identifier
+        :return: sample dict
+        """
+        return _phc_sample_get(
+            self._config.phc,
+            namespace=self._config.config.phc.namespace,
+            name=self._config.config.phc.name,
+            tag=self._config.config.phc.tag,
+            sample_name=identifier,
+        )
+
+    def _phc_key(self, identifier: str) -> tuple:
+        """
+        Get key of the bed file in pephub response cache.
+
+        :param identifier: bed file identifier
+        :return: cache key
+        """
+        return _phc_cache_key(
+            None,
+            self._config.config.phc.namespace,
+            self._config.config.phc.name,
+            self._config.config.phc.tag,
+            identifier,
+        )
+
+    def _get_cached_phc_sample(self, identifier: str) -> Union[dict, None]:
+        """
+        Get sample of the bed file from pephub response cache, without request to pephub.
+
+        :param identifier: bed file identifier
+        :return: sample dict or None if it is not cached
+        """
+        with _PEPHUB_CACHE_LOCK:
+            return _PEPHUB_CACHE.get(self._phc_key(identifier))
+
+    def invalidate_phc_cache(self, identifier: str) -> None:
+        """
+        Remove cached pephub metadata of the bed file.
+
+        :param identifier: bed file identifier
+        """
+        with _PEPHUB_CACHE_LOCK:
+            _PEPHUB_CACHE.pop(self._phc_key(identifier), None)
+
+    def _get_pephub_metadata(self, identifier: str) -> Union[BedPEPHub, None]:
+        """
+        Get raw metadata of the bed file from pephub.
+
+        :param identifier: bed file identifier
+        :return: raw metadata or None if it couldn't be retrieved
+        """
+        try:
+            return BedPEPHub.model_validate(self._get_phc_sample(identifier))
+        except Exception as e:
+            _LOGGER.warning(f"Could not retrieve metadata from pephub. Error: {e}")
+            return None
+
     def get(self, identifier: str, full: bool = False) -> BedMetadata:
         """
         Get file metadata by identifier.
@@ -62,89 +298,140 @@ class BedAgentBedFile:
         :param full: if True, return full metadata, including statistics, files, and raw metadata from pephub
         :return: project metadata
         """
-        statement = select(Bed).where(Bed.id == identifier)
+        results = self.get_many([identifier], full=full)
+        if not results:
+            raise BEDFileNotFoundError(f"Bed file with id: {identifier} not found.")
+        return results[0]
 
-        bed_plots = BedPlots()
-        bed_files = BedFiles()
+    def get_many(self, identifiers: List[str], full: bool = False) -> List[BedMetadata]:
+        """
+        Get metadata of multiple bed files, using one database query.
+        In full mode, raw metadata is fetched from pephub concurrently.
+
+        :param identifiers: list of bed file identifiers
+        :param full: if True, return full metadata, including statistics, files, and raw metadata from pephub
+        :return: list of bed files metadata in order of identifiers. Not found bed files are skipped
+        """
+        if not identifiers:
+            return []
+        unique_identifiers = list(dict.fromkeys(identifiers))
+
+        statement = select(Bed).where(Bed.id.in_(unique_identifiers))
+        if full:
+            statement = statement.options(
+                selectinload(Bed.files), joinedload(Bed.stats), raiseload("*")
+            )
+        else:
+            statement = statement.options(raiseload("*"))
 
+        bed_dicts = {}
+        # bed files, that have metadata in pephub
+        pephub_identifiers = set()
         with Session(self._sa_engine) as session:
-            bed_object = session.scalar(statement)
-            if not bed_object:
-                raise BEDFileNotFoundError(f"Bed file with id: {identifier} not found.")
+            for bed_object in session.scalars(statement):
+                if full:
+                    bed_plots, bed_files = self._get_plots_and_files(bed_object)
+                    bed_stats = _stats_model(bed_object.stats)
+                else:
+                    bed_plots = None
+                    bed_files = None
+                    bed_stats = None
+
+                bed_dicts[bed_object.id] = dict(
+                    id=bed_object.id,
+                    name=bed_object.name,
+                    stats=bed_stats,
+                    plots=bed_plots,
+                    files=bed_files,
+                    description=bed_object.description,
+                    submission_date=bed_object.submission_date,
+                    last_update_date=bed_object.last_update_date,
+                    genome_alias=bed_object.genome_alias,
+                    genome_digest=bed_object.genome_digest,
+                    bed_type=bed_object.bed_type,
+                    bed_format=bed_object.bed_format,
+                    full_response=full,
+                )
+                if bed_object.pephub:
+                    pephub_identifiers.add(bed_object.id)
+
+        found_identifiers = [k for k in unique_identifiers if k in pephub_identifiers]
+        if not full or not found_identifiers:
+            raw_metadata = {}
+        elif len(found_identifiers) == 1:
+            raw_metadata = {
+                found_identifiers[0]: self._get_pephub_metadata(found_identifiers[0])
+            }
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(PEPHUB_MAX_WORKERS, len(found_identifiers))
+            ) as executor:
+                raw_metadata = dict(
+                    zip(
+                        found_identifiers,
+                        executor.map(self._get_pephub_metadata, found_identifiers),
+                    )
+                )
+        if full:
+            # bed files without pephub entry get empty metadata, without request to pephub
+            for identifier in bed_dicts:
+                if identifier not in pephub_identifiers:
+                    raw_metadata[identifier] = BedPEPHub(sample_name=identifier)
+
+        return [
+            BedMetadata(
+                **bed_dicts[identifier], raw_metadata=raw_metadata.get(identifier)
+            )
+            for identifier in identifiers
+            if identifier in bed_dicts
+        ]
 
-            if full:
-                for result in bed_object.files:
-                    # PLOTS
-                    if result.name in BedPlots.model_fields:
-                        setattr(
-                            bed_plots,
-                            result.name,
-                            FileModel(
-                                **result.__dict__,
-                                object_id=f"bed.{identifier}.{result.name}",
-                                access_methods=self._config.construct_access_method_list(
-                                    result.path
-                                ),
-                            ),
-                        )
-                    # FILES
-                    elif result.name in BedFiles.model_fields:
-                        (
-                            setattr(
-                                bed_files,
-                                result.name,
-                                FileModel(
-                                    **result.__dict__,
-                                    object_id=f"bed.{identifier}.{result.name}",
-                                    access_methods=self._config.construct_access_method_list(
-                                        result.path
-                                    ),
-                                ),
-                            ),
-                        )
-
-                    else:
-                        _LOGGER.error(
-                            f"Unknown file type: {result.name}. And is not in the model fields. Skipping.."
-                        )
-                bed_stats = BedStatsModel(**bed_object.stats.__dict__)
-            else:
-                bed_plots = None
-                bed_files = None
-                bed_stats = None
+    def get_bundle(
+        self,
+        identifier: str,
+        fields: Tuple[str, ...] = ("stats", "plots", "files", "classification"),
+    ) -> Dict[str, Union[BedStatsModel, BedPlots, BedFiles, BedClassification, dict]]:
+        """
+        Get several parts of the bed file record, using one database round trip
+        instead of calling separate getters.
 
-        try:
-            if full:
-                bed_metadata = BedPEPHub(
-                    **self._config.phc.sample.get(
-                        namespace=self._config.config.phc.namespace,
-                        name=self._config.config.phc.name,
-                        tag=self._config.config.phc.tag,
-                        sample_name=identifier,
-                    )
+        :param identifier: bed file identifier
+        :param fields: parts to return [stats, plots, files, classification, objects]
+        :return: dict with requested parts
+        """
+        unknown_fields = set(fields) - set(BED_BUNDLE_FIELDS)
+        if unknown_fields:
+            raise BedBaseConfError(
+                f"Unknown fields: {unknown_fields}. Should be one of: {BED_BUNDLE_FIELDS}"
+            )
+
+        # only classification columns are read from the bed row itself
+        options = [load_only(Bed.id, *_CLASSIFICATION_COLUMNS), raiseload("*")]
+        if {"plots", "files", "objects"} & set(fields):
+            options.insert(0, selectinload(Bed.files))
+        if "stats" in fields:
+            options.insert(0, joinedload(Bed.stats))
+
+        bundle = {}
+        with Session(self._sa_engine) as session:
+            bed_object = self._load_bed(session, identifier, *options)
+
+            if "plots" in fields or "files" in fields:
+                bed_plots, bed_files = self._get_plots_and_files(bed_object)
+                if "plots" in fields:
+                    bundle["plots"] = bed_plots
+                if "files" in fields:
+                    bundle["files"] = bed_files
+            if "objects" in fields:
+                bundle["objects"] = self._get_objects(bed_object)
+            if "stats" in fields:
+                bundle["stats"] = (
+                    _stats_model(bed_object.stats) if bed_object.stats else None
                 )
-            else:
-                bed_metadata = None
-        except Exception as e:
-            _LOGGER.warning(f"Could not retrieve metadata from pephub. Error: {e}")
-            bed_metadata = None
-
-        return BedMetadata(
-            id=bed_object.id,
-            name=bed_object.name,
-            stats=bed_stats,
-            plots=bed_plots,
-            files=bed_files,
-            description=bed_object.description,
-            submission_date=bed_object.submission_date,
-            last_update_date=bed_object.last_update_date,
-            raw_metadata=bed_metadata,
-            genome_alias=bed_object.genome_alias,
-            genome_digest=bed_object.genome_digest,
-            bed_type=bed_object.bed_type,
-            bed_format=bed_object.bed_format,
-            full_response=full,
-        )
+            if "classification" in fields:
+                bundle["classification"] = _classification_model(bed_object)
+
+        return bundle
 
     def get_stats(self, identifier: str) -> BedStatsModel:
         """
@@ -154,13 +441,15 @@ class BedAgentBedFile:
 
         :return: project statistics as BedStats object
         """
-        statement = select(BedStats).where(BedStats.id == identifier)
-
         with Session(self._sa_engine) as session:
-            bed_object = session.scalar(statement)
+            bed_object = session.get(
+                BedStats,
+                identifier,
+                options=[load_only(*_STATS_COLUMNS), raiseload("*")],
+            )
             if not bed_object:
                 raise BEDFileNotFoundError(f"Bed file with id: {identifier} not found.")
-            bed_stats = BedStatsModel(**bed_object.__dict__)
+            bed_stats = _stats_model(bed_object)
 
         return bed_stats
 
@@ -171,27 +460,7 @@ class BedAgentBedFile:
         :param identifier: bed file identifier
         :return: project plots
         """
-        statement = select(Bed).where(Bed.id == identifier)
-
-        with Session(self._sa_engine) as session:
-            bed_object = session.scalar(statement)
-            if not bed_object:
-                raise BEDFileNotFoundError(f"Bed file with id: {identifier} not found.")
-            bed_plots = BedPlots()
-            for result in bed_object.files:
-                if result.name in BedPlots.model_fields:
-                    setattr(
-                        bed_plots,
-                        result.name,
-                        FileModel(
-                            **result.__dict__,
-                            object_id=f"bed.{identifier}.{result.name}",
-                            access_methods=self._config.construct_access_method_list(
-                                result.path
-                            ),
-                        ),
-                    )
-        return bed_plots
+        return self.get_bundle(identifier, fields=("plots",))["plots"]
 
     def get_files(self, identifier: str) -> BedFiles:
         """
@@ -200,27 +469,7 @@ class BedAgentBedFile:
         :param identifier: bed file identifier
         :return: project files
         """
-        statement = select(Bed).where(Bed.id == identifier)
-
-        with Session(self._sa_engine) as session:
-            bed_object = session.scalar(statement)
-            if not bed_object:
-                raise BEDFileNotFoundError(f"Bed file with id: {identifier} not found.")
-            bed_files = BedFiles()
-            for result in bed_object.files:
-                if result.name in BedFiles.model_fields:
-                    setattr(
-                        bed_files,
-                        result.name,
-                        FileModel(
-                            **result.__dict__,
-                            object_id=f"bed.{identifier}.{result.name}",
-                            access_methods=self._config.construct_access_method_list(
-                                result.path
-                            ),
-                        ),
-                    )
-        return bed_files
+        return self.get_bundle(identifier, fields=("files",))["files"]
 
     def get_raw_metadata(self, identifier: str) -> BedPEPHub:
         """
@@ -229,17 +478,23 @@ class BedAgentBedFile:
         :param identifier: bed file identifier
         :return: project metadata
         """
-        try:
-            bed_metadata = self._config.phc.sample.get(
-                namespace=self._config.config.phc.namespace,
-                name=self._config.config.phc.name,
-                tag=self._config.config.phc.tag,
-                sample_name=identifier,
-            )
-        except Exception as e:
-            _LOGGER.warning(f"Could not retrieve metadata from pephub. Error: {e}")
-            bed_metadata = {}
-        return BedPEPHub(**bed_metadata)
+        bed_metadata = self._get_cached_phc_sample(identifier)
+        if bed_metadata is None:
+            # pephub flag is checked only on cache miss, so cache hits need no I/O
+            with Session(self._sa_engine) as session:
+                in_pephub = session.scalar(
+                    select(Bed.pephub).where(Bed.id == identifier)
+                )
+            if in_pephub is False:
+                # bed file was not added to pephub, no need to request it
+                return BedPEPHub(sample_name=identifier)
+
+            try:
+                bed_metadata = self._get_phc_sample(identifier)
+            except Exception as e:
+                _LOGGER.warning(f"Could not retrieve metadata from pephub. Error: {e}")
+                bed_metadata = {}
+        return BedPEPHub.model_validate(bed_metadata)
 
     def get_classification(self, identifier: str) -> BedClassification:
         """
@@ -248,15 +503,7 @@ class BedAgentBedFile:
         :param identifier: bed file identifier
         :return: project classification
         """
-        statement = select(Bed).where(Bed.id == identifier)
-
-        with Session(self._sa_engine) as session:
-            bed_object = session.scalar(statement)
-            if not bed_object:
-                raise BEDFileNotFoundError(f"Bed file with id: {identifier} not found.")
-            bed_classification = BedClassification(**bed_object.__dict__)
-
-        return bed_classification
+        return self.get_bundle(identifier, fields=("classification",))["classification"]
 
     def get_objects(self, identifier: str) -> Dict[str, FileModel]:
         """
@@ -265,17 +512,7 @@ class BedAgentBedFile:
         :param identifier:  bed file identifier
         :return: project objects dict
         """
-        statement = select(Bed).where(Bed.id == identifier)
-        return_dict = {}
-
-        with Session(self._sa_engine) as session:
-            bed_object = session.scalar(statement)
-            if not bed_object:
-                raise BEDFileNotFoundError(f"Bed file with id: {identifier} not found.")
-            for result in bed_object.files:
-                return_dict[result.name] = FileModel(**result.__dict__)
-
-        return return_dict
+        return self.get_bundle(identifier, fields=("objects",))["objects"]
 
     def get_ids_list(
         self,
@@ -315,7 +552,7 @@ class BedAgentBedFile:
             count=len(bed_ids),
             limit=limit,
             offset=offset,
-            results=[self.get(result[0], full=full) for result in bed_ids],
+            results=self.get_many([result[0] for result in bed_ids], full=full),
         )
 
     def add(
@@ -364,16 +601,19 @@ class BedAgentBedFile:
             else:
                 self.delete(identifier)
 
-        stats = BedStatsModel(**stats)
+        stats = BedStatsModel.model_validate(stats)
         # TODO: we should not check for specific keys, of the plots!
-        plots = BedPlots(**plots)
-        files = BedFiles(**files)
+        plots = BedPlots.model_validate(plots)
+        files = BedFiles.model_validate(files)
 
-        classification = BedClassification(**classification)
+        classification = BedClassification.model_validate(classification)
+        # stored in the db, so that getters don't request pephub for bed files without metadata
+        in_pephub = False
         if upload_pephub:
-            metadata = BedPEPHub(**metadata)
+            metadata = BedPEPHub.model_validate(metadata)
             try:
                 self.upload_pephub(identifier, metadata.model_dump(), overwrite)
+                in_pephub = True
             except Exception as e:
                 _LOGGER.warning(
                     f"Could not upload to pephub. Error: {e}. nofail: {nofail}"
@@ -407,44 +647,37 @@ class BedAgentBedFile:
                 plots = self._config.upload_files_s3(
                     identifier, files=plots, base_path=local_path, type="plots"
                 )
-        with Session(self._sa_engine) as session:
+        with Session(self._sa_engine, autoflush=False) as session, session.begin():
             new_bed = Bed(
                 id=identifier,
                 **classification.model_dump(),
                 indexed=upload_qdrant,
-                pephub=upload_pephub,
+                pephub=in_pephub,
             )
             session.add(new_bed)
-            if upload_s3:
-                for k, v in files:
-                    if v:
-                        new_file = Files(
-                            **v.model_dump(
-                                exclude_none=True,
-                                exclude_unset=True,
-                                exclude={"object_id", "access_methods"},
-                            ),
-                            bedfile_id=identifier,
-                            type="file",
-                        )
-                        session.add(new_file)
-                for k, v in plots:
-                    if v:
-                        new_plot = Files(
-                            **v.model_dump(
-                                exclude_none=True,
-                                exclude_unset=True,
-                                exclude={"object_id", "access_methods"},
-                            ),
-                            bedfile_id=identifier,
-                            type="plot",
-                        )
-                        session.add(new_plot)
 
             new_bedstat = BedStats(**stats.model_dump(), id=identifier)
             session.add(new_bedstat)
 
-            session.commit()
+            # bed row has to exist before files referencing it are inserted
+            session.flush()
+
+            if upload_s3:
+                file_rows = [
+                    {
+                        **v.model_dump(
+                            exclude_none=True,
+                            exclude_unset=True,
+                            exclude={"object_id", "access_methods"},
+                        ),
+                        "bedfile_id": identifier,
+                        "type": file_type,
+                    }
+                    for file_type, file_models in (("file", files), ("plot", plots))
+                    for _, v in get_set_fields(file_models)
+                ]
+                if file_rows:
+                    session.execute(insert(Files), file_rows)
 
         return None
 
@@ -485,13 +718,13 @@ class BedAgentBedFile:
                 f"Bed file with id: {identifier} not found. Cannot update."
             )
 
-        stats = BedStatsModel(**stats)
-        plots = BedPlots(**plots)
-        files = BedFiles(**files)
-        classification = BedClassification(**classification)
+        stats = BedStatsModel.model_validate(stats)
+        plots = BedPlots.model_validate(plots)
+        files = BedFiles.model_validate(files)
+        classification = BedClassification.model_validate(classification)
 
         if upload_pephub:
-            metadata = BedPEPHub(**metadata)
+            metadata = BedPEPHub.model_validate(metadata)
             try:
                 self.update_pephub(identifier, metadata.model_dump(), overwrite)
             except Exception as e:
@@ -508,8 +741,6 @@ class BedAgentBedFile:
                 identifier, files.bed_file.path, {"bed_id": identifier}
             )
 
-        statement = select(Bed).where(Bed.id == identifier)
-
         if upload_s3:
             _LOGGER.warning("S3 upload is not implemented yet")
             # if files:
@@ -523,7 +754,7 @@ class BedAgentBedFile:
             #     )
 
         with Session(self._sa_engine) as session:
-            bed_object = session.scalar(statement)
+            bed_object = session.get(Bed, identifier)
 
             setattr(bed_object, **stats.model_dump())
             setattr(bed_object, **classification.model_dump())
@@ -566,10 +797,11 @@ class BedAgentBedFile:
             raise BEDFileNotFoundError(f"Bed file with id: {identifier} not found.")
 
         with Session(self._sa_engine) as session:
-            statement = select(Bed).where(Bed.id == identifier)
-            bed_object = session.scalar(statement)
+            bed_object = session.get(Bed, identifier)
 
-            files = [FileModel(**k.__dict__) for k in bed_object.files]
+            files = [
+                FileModel.model_construct(**column_values(k)) for k in bed_object.files
+            ]
             delete_pephub = bed_object.pephub
             delete_qdrant = bed_object.indexed
 
@@ -594,6 +826,7 @@ class BedAgentBedFile:
             sample_dict=metadata,
             overwrite=overwrite,
         )
+        self.invalidate_phc_cache(identifier)
 
     def update_pephub(self, identifier: str, metadata: dict, overwrite: bool = False):
         if not metadata:
@@ -606,6 +839,7 @@ class BedAgentBedFile:
             sample_name=identifier,
             sample_dict=metadata,
         )
+        self.invalidate_phc_cache(identifier)
 
     def delete_pephub_sample(self, identifier: str):
         """
@@ -622,11 +856,36 @@ class BedAgentBedFile:
             )
         except ResponseError as e:
             _LOGGER.warning(f"Could not delete from pephub. Error: {e}")
+        self.invalidate_phc_cache(identifier)
+
+    def _get_bed_embedding(self, bed_file: Union[str, "RegionSet"]) -> "np.ndarray":
+        """
+        Convert bed file to vector using region2vec model
+
+        :param bed_file: path to the bed file, or RegionSet object
+        :return: bed file vector
+        """
+        import numpy as np
+        from geniml.io import RegionSet
+
+        if isinstance(bed_file, str):
+            bed_region_set = RegionSet(bed_file)
+        elif isinstance(bed_file, RegionSet):
+            bed_region_set = bed_file
+        else:
+            raise BedBaseConfError(
+                "Could not add add region to qdrant. Invalid type, or path. "
+            )
+        # keep float32 end to end: np.mean would accumulate and return float64
+        embeddings = np.asarray(
+            self._config.r2v.encode(bed_region_set), dtype=np.float32
+        )
+        return embeddings.mean(axis=0, dtype=np.float32)
 
     def upload_file_qdrant(
         self,
         bed_id: str,
-        bed_file: Union[str, RegionSet],
+        bed_file: Union[str, "RegionSet"],
         payload: dict = None,
     ) -> None:
         """
@@ -639,27 +898,84 @@ class BedAgentBedFile:
         :param payload: additional metadata to store alongside vectors
         :return: None
         """
+        self.upload_file_qdrant_many([(bed_id, bed_file, payload)])
+        return None
 
-        _LOGGER.info(f"Adding bed file to qdrant. bed_id: {bed_id}")
-        if isinstance(bed_file, str):
-            bed_region_set = RegionSet(bed_file)
-        elif isinstance(bed_file, RegionSet):
-            bed_region_set = bed_file
-        else:
-            raise BedBaseConfError(
-                "Could not add add region to qdrant. Invalid type, or path. "
-            )
-        bed_embedding = np.mean(self._config.r2v.encode(bed_region_set), axis=0)
-
-        # Upload bed file vector to the database
-        vec_dim = bed_embedding.shape[0]
-        self._qdrant_engine.load(
-            ids=[bed_id],
-            vectors=bed_embedding.reshape(1, vec_dim),
-            payloads=[{**payload}],
-        )
+    def upload_file_qdrant_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, "RegionSet"], Union[dict, None]]],
+        batch_size: int = QDRANT_UPLOAD_BATCH_SIZE,
+    ) -> None:
+        """
+        Convert bed files to vectors and add them to qdrant database in batches.
+        Items are consumed lazily, so only one batch of vectors is kept in memory.
+
+        !Warning: only hg38 genome can be added to qdrant!
+
+        :param items: iterable of (bed file id, path to the bed file or RegionSet object, payload)
+        :param batch_size: number of vectors uploaded to qdrant in one request
+        :return: None
+        """
+        ids = []
+        vectors = []
+        payloads = []
+        for bed_id, bed_file, payload in items:
+            _LOGGER.info(f"Adding bed file to qdrant. bed_id: {bed_id}")
+            ids.append(bed_id)
+            vectors.append(self._get_bed_embedding(bed_file))
+            payloads.append({**(payload or {})})
+
+            if len(ids) >= batch_size:
+                self._load_qdrant_vectors(ids, vectors, payloads)
+                ids, vectors, payloads = [], [], []
+
+        if ids:
+            self._load_qdrant_vectors(ids, vectors, payloads)
         return None
 
+    def _load_qdrant_vectors(
+        self, ids: List[str], vectors: List["np.ndarray"], payloads: List[dict]
+    ) -> None:
+        """
+        Upload batch of bed file vectors to qdrant in one request
+
+        :param ids: bed file ids
+        :param vectors: bed file vectors
+        :param payloads: metadata stored alongside vectors
+        :return: None
+        """
+        import numpy as np
+
+        self._config.qdrant_engine.load(
+            ids=ids,
+            vectors=np.stack(vectors).astype(np.float32, copy=False),
+            payloads=payloads,
+        )
+        _LOGGER.info(f"Uploaded {len(ids)} bed files to qdrant.")
+
+    def _get_search_results(self, results: List[dict]) -> List[QdrantSearchResult]:
+        """
+        Attach bed file metadata to qdrant search results, using one database query
+
+        :param results: qdrant search results
+        :return: list of search results with metadata. Results without bed file in the database are skipped
+        """
+        result_ids = [result["id"].replace("-", "") for result in results]
+        metadata = {
+            bed_metadata.id: bed_metadata for bed_metadata in self.get_many(result_ids)
+        }
+
+        results_list = []
+        for result, result_id in zip(results, result_ids):
+            result_meta = metadata.get(result_id)
+            if not result_meta:
+                _LOGGER.warning(
+                    f"Could not retrieve metadata for bed file: {result_id}. Bed file not found."
+                )
+                continue
+            results_list.append(QdrantSearchResult(**result, metadata=result_meta))
+        return results_list
+
     def text_to_bed_search(
         self, query: str, limit: int = 10, offset: int = 0
     ) -> BedListSearchResult:
@@ -673,46 +989,25 @@ class BedAgentBedFile:
         :return: list of bed file metadata
         """
         _LOGGER.info(f"Looking for: {query}")
-        _LOGGER.info(f"Using backend: {self._config.t2bsi}")
+        t2bsi = self._config.t2bsi
+        _LOGGER.info(f"Using backend: {t2bsi}")
 
-        results = self._config.t2bsi.query_search(query, limit=limit, offset=offset)
-        results_list = []
-        for result in results:
-            result_id = result["id"].replace("-", "")
-            try:
-                result_meta = self.get(result_id)
-            except BEDFileNotFoundError as e:
-                _LOGGER.warning(
-                    f"Could not retrieve metadata for bed file: {result_id}. Error: {e}"
-                )
-                continue
-            if result_meta:
-                results_list.append(QdrantSearchResult(**result, metadata=result_meta))
+        results = t2bsi.query_search(query, limit=limit, offset=offset)
+        results_list = self._get_search_results(results)
         return BedListSearchResult(
             count=len(results), limit=limit, offset=offset, results=results_list
         )
 
     def bed_to_bed_search(
         self,
-        region_set: RegionSet,
+        region_set: "RegionSet",
         limit: int = 10,
         offset: int = 0,
     ) -> BedListSearchResult:
         results = self._config.b2bsi.query_search(
             region_set, limit=limit, offset=offset
         )
-        results_list = []
-        for result in results:
-            result_id = result["id"].replace("-", "")
-            try:
-                result_meta = self.get(result_id)
-            except BEDFileNotFoundError as e:
-                _LOGGER.warning(
-                    f"Could not retrieve metadata for bed file: {result_id}. Error: {e}"
-                )
-                continue
-            if result_meta:
-                results_list.append(QdrantSearchResult(**result, metadata=result_meta))
+        results_list = self._get_search_results(results)
         return BedListSearchResult(
             count=len(results_list),
             limit=limit,
@@ -729,6 +1024,8 @@ class BedAgentBedFile:
 
         Upload all files to qdrant.
         """
+        from geniml.bbclient import BBClient
+
         bb_client = BBClient()
 
         statement = select(Bed.id).where(Bed.genome_alias == QDRANT_GENOME)
@@ -738,14 +1035,15 @@ class BedAgentBedFile:
 
         bed_ids = [bed_result[0] for bed_result in bed_ids]
 
-        for record_id in bed_ids:
-            bed_region_set_obj = bb_client.load_bed(record_id)
-
-            self.upload_file_qdrant(
-                bed_id=record_id,
-                bed_file=bed_region_set_obj,
-                payload={"bed_id": record_id},
+        # bed files are downloaded one by one, while vectors are uploaded in batches
+        self.upload_file_qdrant_many(
+            (
+                record_id,
+                bb_client.load_bed(record_id),
+                {"bed_id": record_id},
             )
+            for record_id in bed_ids
+        )
 
         return None
 
@@ -756,6 +1054,7 @@ class BedAgentBedFile:
         :param identifier: bed file identifier
         :return: None
         """
+        from qdrant_client.models import PointIdsList
 
         result = self._config.qdrant_engine.qd_client.delete(
             collection_name=self._config.config.qdrant.collection,
@@ -769,6 +1068,8 @@ class BedAgentBedFile:
         """
         Create qdrant collection for bed files.
         """
+        from qdrant_client.models import Distance, VectorParams
+
         return self._config.qdrant_engine.qd_client.create_collection(
             collection_name=self._config.config.qdrant.collection,
             vectors_config=VectorParams(size=100, distance=Distance.DOT),
@@ -781,10 +1082,8 @@ class BedAgentBedFile:
         :param identifier: bed file identifier
         :return: True if bed file exists, False otherwise
         """
-        statement = select(Bed).where(Bed.id == identifier)
-
         with Session(self._sa_engine) as session:
-            bed_object = session.scalar(statement)
+            bed_object = session.get(Bed, identifier)
             if not bed_object:
                 return False
             return True
@@ -1,6 +1,5 @@
 import logging
 
-from geniml.io.utils import compute_md5sum_bedset
 from typing import Dict, List
 
 from sqlalchemy import Float, Numeric, func, or_, select
@@ -8,11 +7,18 @@ from sqlalchemy.orm import Session
 
 from bbconf.config_parser import BedBaseConfig
 from bbconf.const import PKG_NAME
-from bbconf.db_utils import BedFileBedSetRelation, BedSets, BedStats, Files
+from bbconf.db_utils import (
+    BedFileBedSetRelation,
+    BedSets,
+    BedStats,
+    Files,
+    column_values,
+)
 from bbconf.exceptions import (
     BedSetNotFoundError,
     BedSetExistsError,
 )
+from bbconf.helpers import get_set_fields
 from bbconf.models.bed_models import BedStatsModel
 from bbconf.models.bedset_models import (
     BedSetBedFiles,
@@ -50,10 +56,8 @@ class BedAgentBedSet:
         :return: project metadata
         """
 
-        statement = select(BedSets).where(BedSets.id == identifier)
-
         with Session(self._db_engine.engine) as session:
-            bedset_obj = session.scalar(statement)
+            bedset_obj = session.get(BedSets, identifier)
             if not bedset_obj:
                 raise BedSetNotFoundError(identifier)
             list_of_bedfiles = [
@@ -62,11 +66,13 @@ class BedAgentBedSet:
             if full:
                 plots = BedSetPlots()
                 for plot in bedset_obj.files:
-                    setattr(plots, plot.name, FileModel(**plot.__dict__))
+                    setattr(plots, plot.name, FileModel(**column_values(plot)))
 
                 stats = BedSetStats(
-                    mean=BedStatsModel(**bedset_obj.bedset_means),
-                    sd=BedStatsModel(**bedset_obj.bedset_standard_deviation),
+                    mean=BedStatsModel.model_validate(bedset_obj.bedset_means),
+                    sd=BedStatsModel.model_validate(
+                        bedset_obj.bedset_standard_deviation
+                    ),
                 ).model_dump()
             else:
                 plots = None
@@ -91,10 +97,8 @@ class BedAgentBedSet:
         :param identifier: bedset identifier
         :return: bedset plots
         """
-        statement = select(BedSets).where(BedSets.id == identifier)
-
         with Session(self._db_engine.engine) as session:
-            bedset_object = session.scalar(statement)
+            bedset_object = session.get(BedSets, identifier)
             if not bedset_object:
                 raise BedSetNotFoundError(f"Bed file with id: {identifier} not found.")
             bedset_files = BedSetPlots()
@@ -104,7 +108,7 @@ class BedAgentBedSet:
                         bedset_files,
                         result.name,
                         FileModel(
-                            **result.__dict__,
+                            **column_values(result),
                             object_id=f"bed.{identifier}.{result.name}",
                             access_methods=self.config.construct_access_method_list(
                                 result.path
@@ -120,16 +124,15 @@ class BedAgentBedSet:
         :param identifier: bedset identifier
         :return: bedset objects
         """
-        statement = select(BedSets).where(BedSets.id == identifier)
         return_dict = {}
 
         with Session(self._db_engine.engine) as session:
-            bedset_object = session.scalar(statement)
+            bedset_object = session.get(BedSets, identifier)
             if not bedset_object:
                 raise BedSetNotFoundError(f"Bedset with id: {identifier} not found.")
             for result in bedset_object.files:
                 return_dict[result.name] = FileModel(
-                    **result.__dict__,
+                    **column_values(result),
                     object_id=f"bed.{identifier}.{result.name}",
                     access_methods=self.config.construct_access_method_list(
                         result.path
@@ -145,14 +148,15 @@ class BedAgentBedSet:
         :param identifier: bedset identifier
         :return: bedset statistics
         """
-        statement = select(BedSets).where(BedSets.id == identifier)
         with Session(self._db_engine.engine) as session:
-            bedset_object = session.scalar(statement)
+            bedset_object = session.get(BedSets, identifier)
             if not bedset_object:
                 raise BedSetNotFoundError(f"Bedset with id: {identifier} not found.")
             return BedSetStats(
-                mean=BedStatsModel(**bedset_object.bedset_means),
-                sd=BedStatsModel(**bedset_object.bedset_standard_deviation),
+                mean=BedStatsModel.model_validate(bedset_object.bedset_means),
+                sd=BedStatsModel.model_validate(
+                    bedset_object.bedset_standard_deviation
+                ),
             )
 
     def create(
@@ -185,6 +189,9 @@ class BedAgentBedSet:
         :param overwrite: overwrite the record in the database
         :return: None
         """
+        # geniml is heavy, so it is imported only when bedset is created
+        from geniml.io.utils import compute_md5sum_bedset
+
         _LOGGER.info(f"Creating bedset '{identifier}'")
 
         if statistics:
@@ -214,7 +221,7 @@ class BedAgentBedSet:
         )
 
         if upload_s3:
-            plots = BedSetPlots(**plots)
+            plots = BedSetPlots.model_validate(plots)
             plots = self.config.upload_files_s3(
                 identifier, files=plots, base_path=local_path, type="bedsets"
             )
@@ -230,14 +237,13 @@ class BedAgentBedSet:
                         BedFileBedSetRelation(bedset_id=identifier, bedfile_id=bedfile)
                     )
                 if upload_s3:
-                    for k, v in plots:
-                        if v:
-                            new_file = Files(
-                                **v.model_dump(exclude_none=True, exclude_unset=True),
-                                bedset_id=identifier,
-                                type="plot",
-                            )
-                            session.add(new_file)
+                    for _, v in get_set_fields(plots):
+                        new_file = Files(
+                            **v.model_dump(exclude_none=True, exclude_unset=True),
+                            bedset_id=identifier,
+                            type="plot",
+                        )
+                        session.add(new_file)
 
                 session.commit()
         except Exception as e:
@@ -364,14 +370,13 @@ class BedAgentBedSet:
 
         :return: list of bedfiles
         """
-        statement = select(BedSets).where(BedSets.id == identifier)
-
         with Session(self._db_engine.engine) as session:
-            bedset_obj = session.scalar(statement)
+            bedset_obj = session.get(BedSets, identifier)
             bedfiles_list = bedset_obj.bedfiles
 
             results = [
-                BedMetadata(**bedfile.bedfile.__dict__) for bedfile in bedfiles_list
+                BedMetadata(**column_values(bedfile.bedfile))
+                for bedfile in bedfiles_list
             ]
 
         return BedSetBedFiles(
@@ -392,10 +397,10 @@ class BedAgentBedSet:
         _LOGGER.info(f"Deleting bedset '{identifier}'")
 
         with Session(self._db_engine.engine) as session:
-            statement = select(BedSets).where(BedSets.id == identifier)
-
-            bedset_obj = session.scalar(statement)
-            files = [FileModel(**k.__dict__) for k in bedset_obj.files]
+            bedset_obj = session.get(BedSets, identifier)
+            files = [
+                FileModel.model_construct(**column_values(k)) for k in bedset_obj.files
+            ]
 
             session.delete(bedset_obj)
             session.commit()
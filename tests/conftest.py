@@ -3,6 +3,7 @@ import os
 import pytest
 
 from bbconf.bbagent import BedBaseAgent
+from bbconf.modules.bedfiles import clear_pephub_cache
 
 from .utils import BED_TEST_ID
 
@@ -22,6 +23,13 @@ def get_bbagent():
     return BedBaseAgent(config=CONFIG_PATH)
 
 
+@pytest.fixture(autouse=True)
+def clean_pephub_cache():
+    clear_pephub_cache()
+    yield
+    clear_pephub_cache()
+
+
 @pytest.fixture(scope="function")
 def bbagent_obj():
     yield BedBaseAgent(config=CONFIG_PATH)
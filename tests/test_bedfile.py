@@ -7,7 +7,13 @@ from bbconf.db_utils import Bed, Files
 from bbconf.exceptions import BedFIleExistsError, BEDFileNotFoundError
 
 from .conftest import get_bbagent
-from .utils import BED_TEST_ID, ContextManagerDBTesting
+from .utils import BED_TEST_ID, ContextManagerDBTesting, count_queries
+
+
+def set_pephub_flag(bbagent_obj: BedBaseAgent, value: bool = True) -> None:
+    with Session(bbagent_obj.config.db_engine.engine) as session:
+        session.get(Bed, BED_TEST_ID).pephub = value
+        session.commit()
 
 
 def test_bb_database():
@@ -51,6 +57,7 @@ class Test_BedFile_Agent:
 
     def test_get_all(self, bbagent_obj, mocked_phc):
         with ContextManagerDBTesting(config=bbagent_obj.config, add_data=True):
+            set_pephub_flag(bbagent_obj)
             return_result = bbagent_obj.bed.get(BED_TEST_ID, full=True)
             assert return_result is not None
             assert return_result.files is not None
@@ -63,6 +70,13 @@ class Test_BedFile_Agent:
             assert return_result.files.bed_file is not None
             assert return_result.plots.chrombins is not None
 
+    @pytest.mark.parametrize("method", ["get_plots", "get_files", "get_objects"])
+    def test_get_files_query_count(self, bbagent_obj, method):
+        with ContextManagerDBTesting(config=bbagent_obj.config, add_data=True):
+            with count_queries(bbagent_obj.config.db_engine.engine) as statements:
+                getattr(bbagent_obj.bed, method)(BED_TEST_ID)
+            assert len(statements) <= 2
+
     def test_get_all_not_found(self, bbagent_obj):
         with ContextManagerDBTesting(config=bbagent_obj.config, add_data=True):
             return_result = bbagent_obj.bed.get(BED_TEST_ID, full=False)
@@ -78,11 +92,42 @@ class Test_BedFile_Agent:
 
     def test_get_raw_metadata(self, bbagent_obj, mocked_phc):
         with ContextManagerDBTesting(config=bbagent_obj.config, add_data=True):
+            set_pephub_flag(bbagent_obj)
             return_result = bbagent_obj.bed.get_raw_metadata(BED_TEST_ID)
 
             assert return_result is not None
             assert return_result.sample_name == BED_TEST_ID
 
+    def test_get_raw_metadata_cached(self, bbagent_obj, mocker):
+        phc_get_mock = mocker.patch(
+            "pephubclient.modules.sample.PEPHubSample.get",
+            return_value={"sample_name": BED_TEST_ID},
+        )
+        with ContextManagerDBTesting(config=bbagent_obj.config, add_data=True):
+            set_pephub_flag(bbagent_obj)
+            bbagent_obj.bed.get_raw_metadata(BED_TEST_ID)
+            with count_queries(bbagent_obj.config.db_engine.engine) as statements:
+                bbagent_obj.bed.get_raw_metadata(BED_TEST_ID)
+            assert phc_get_mock.call_count == 1
+            # cache hit needs neither pephub nor database
+            assert len(statements) == 0
+
+            bbagent_obj.bed.invalidate_phc_cache(BED_TEST_ID)
+            bbagent_obj.bed.get_raw_metadata(BED_TEST_ID)
+            assert phc_get_mock.call_count == 2
+
+    def test_get_raw_metadata_not_in_pephub(self, bbagent_obj, mocker):
+        phc_get_mock = mocker.patch("pephubclient.modules.sample.PEPHubSample.get")
+        with ContextManagerDBTesting(config=bbagent_obj.config, add_data=True):
+            set_pephub_flag(bbagent_obj, False)
+
+            return_result = bbagent_obj.bed.get_raw_metadata(BED_TEST_ID)
+            full_result = bbagent_obj.bed.get(BED_TEST_ID, full=True)
+
+        assert not phc_get_mock.called
+        assert return_result.sample_name == BED_TEST_ID
+        assert full_result.raw_metadata.sample_name == BED_TEST_ID
+
     def test_get_stats(self, bbagent_obj):
         with ContextManagerDBTesting(config=bbagent_obj.config, add_data=True):
             return_result = bbagent_obj.bed.get_stats(BED_TEST_ID)
@@ -118,6 +163,33 @@ class Test_BedFile_Agent:
         assert return_result is not None
         assert return_result.bed_type == "bed6+4"
 
+    def test_get_many(self, bbagent_obj, mocked_phc):
+        with ContextManagerDBTesting(config=bbagent_obj.config, add_data=True):
+            return_result = bbagent_obj.bed.get_many(
+                [BED_TEST_ID, "not_f", BED_TEST_ID], full=True
+            )
+
+        assert len(return_result) == 2
+        assert return_result[0].id == BED_TEST_ID
+        assert return_result[0].raw_metadata is not None
+        assert return_result[0].files.bed_file is not None
+
+    def test_get_bundle(self, bbagent_obj):
+        with ContextManagerDBTesting(config=bbagent_obj.config, add_data=True):
+            with count_queries(bbagent_obj.config.db_engine.engine) as statements:
+                return_result = bbagent_obj.bed.get_bundle(BED_TEST_ID)
+            assert len(statements) <= 2
+
+        assert return_result["stats"].number_of_regions == 1
+        assert return_result["plots"].chrombins is not None
+        assert return_result["files"].bed_file is not None
+        assert return_result["classification"].bed_type == "bed6+4"
+
+    def test_get_bundle_not_found(self, bbagent_obj):
+        with ContextManagerDBTesting(config=bbagent_obj.config, add_data=True):
+            with pytest.raises(BEDFileNotFoundError):
+                bbagent_obj.bed.get_bundle("not_f")
+
     def test_get_list(self, bbagent_obj):
         with ContextManagerDBTesting(config=bbagent_obj.config, add_data=True):
             return_result = bbagent_obj.bed.get_ids_list(limit=100, offset=0)
@@ -182,10 +254,16 @@ class Test_BedFile_Agent:
         assert return_result.offset == 1
 
     def test_bed_delete(self, bbagent_obj, mocker):
-        mocker.patch("bbconf.config_parser.bedbaseconfig.BedBaseConfig.delete_s3")
+        mocker.patch("bbconf.config_parser.bedbaseconfig.BedBaseConfig.delete_s3_batch")
+        delete_pephub_mock = mocker.patch(
+            "bbconf.modules.bedfiles.BedAgentBedFile.delete_pephub_sample"
+        )
         with ContextManagerDBTesting(config=bbagent_obj.config, add_data=True):
+            set_pephub_flag(bbagent_obj)
             bbagent_obj.bed.delete(BED_TEST_ID)
 
+            delete_pephub_mock.assert_called_once_with(BED_TEST_ID)
+
             assert not bbagent_obj.bed.exists(BED_TEST_ID)
 
             with Session(bbagent_obj.config.db_engine.engine) as session:
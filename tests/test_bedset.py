@@ -177,7 +177,7 @@ class TestBedset:
             config=bbagent_obj.config, add_data=True, bedset=True
         ):
             mocker.patch(
-                "bbconf.config_parser.bedbaseconfig.BedBaseConfig.delete_s3",
+                "bbconf.config_parser.bedbaseconfig.BedBaseConfig.delete_s3_batch",
                 return_value=True,
             )
             bbagent_obj.bedset.delete(BEDSET_TEST_ID)
@@ -189,7 +189,7 @@ class TestBedset:
             config=bbagent_obj.config, add_data=True, bedset=True
         ):
             mocker.patch(
-                "bbconf.config_parser.bedbaseconfig.BedBaseConfig.delete_s3",
+                "bbconf.config_parser.bedbaseconfig.BedBaseConfig.delete_s3_batch",
                 return_value=True,
             )
             bbagent_obj.bedset.delete(BEDSET_TEST_ID)
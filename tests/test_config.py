@@ -0,0 +1,280 @@
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+
+import pytest
+import yaml
+from botocore.exceptions import ClientError
+
+from bbconf.config_parser.bedbaseconfig import (
+    BedBaseConfig,
+    _config_cache_key,
+    _load_config_cached,
+    _parse_config_cached,
+    _read_config_cache,
+    _write_config_cache,
+    clear_config_cache,
+)
+from bbconf.config_parser.const import CONFIG_CACHE_SUFFIX
+
+from .conftest import CONFIG_PATH
+
+
+@pytest.fixture()
+def config_obj(mocker):
+    # config tests don't need database
+    mocker.patch.object(BedBaseConfig, "_init_db_engine", return_value=None)
+    return BedBaseConfig(CONFIG_PATH)
+
+
+@pytest.fixture()
+def config_path(tmp_path):
+    path = str(tmp_path / "config.yaml")
+    shutil.copy(CONFIG_PATH, path)
+    clear_config_cache()
+    yield path
+    clear_config_cache()
+
+
+def _touch(path: str, mtime_ns: int) -> None:
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestConfigCacheFile:
+    def test_fresh_cache_is_used(self, config_path):
+        cache_key = _config_cache_key(config_path)
+        _write_config_cache(config_path, cache_key, {"cached": True})
+
+        assert os.path.exists(config_path + CONFIG_CACHE_SUFFIX)
+        assert _read_config_cache(config_path, _config_cache_key(config_path)) == {
+            "cached": True
+        }
+
+    def test_cache_is_stale_after_file_change(self, config_path):
+        _write_config_cache(config_path, _config_cache_key(config_path), {"a": 1})
+
+        mtime_ns = os.stat(config_path).st_mtime_ns
+        _touch(config_path, mtime_ns + 10**9)
+        assert _read_config_cache(config_path, _config_cache_key(config_path)) is None
+
+        _write_config_cache(config_path, _config_cache_key(config_path), {"a": 1})
+        with open(config_path, "a") as f:
+            f.write("\n# comment")
+        _touch(config_path, mtime_ns + 10**9)
+        assert _read_config_cache(config_path, _config_cache_key(config_path)) is None
+
+    def test_content_version_header_is_key(self, config_path):
+        with open(config_path) as f:
+            content = f.read()
+        with open(config_path, "w") as f:
+            f.write("# content-version: abc123\n" + content)
+
+        assert _config_cache_key(config_path) == "abc123"
+        _write_config_cache(config_path, "abc123", {"a": 1})
+
+        # same version, but different modification time
+        _touch(config_path, os.stat(config_path).st_mtime_ns + 10**9)
+        assert _read_config_cache(config_path, _config_cache_key(config_path)) == {
+            "a": 1
+        }
+
+    def test_read_only_directory(self, config_path, mocker):
+        mocker.patch(
+            "bbconf.config_parser.bedbaseconfig.tempfile.mkstemp",
+            side_effect=PermissionError("read-only"),
+        )
+        _write_config_cache(config_path, _config_cache_key(config_path), {"a": 1})
+
+        assert not os.path.exists(config_path + CONFIG_CACHE_SUFFIX)
+        assert BedBaseConfig._read_config_file(config_path).database.host == "localhost"
+
+    def test_file_changed_while_parsing(self, config_path, mocker):
+        original_load = yaml.load
+
+        def load_and_change(*args, **kwargs):
+            data = original_load(*args, **kwargs)
+            with open(config_path, "a") as f:
+                f.write("\n# changed")
+            return data
+
+        mocker.patch(
+            "bbconf.config_parser.bedbaseconfig.yaml.load",
+            side_effect=load_and_change,
+        )
+        _load_config_cached(config_path, 0, 0)
+
+        # data parsed from the old content is not valid for the new content
+        assert _read_config_cache(config_path, _config_cache_key(config_path)) is None
+
+
+class TestLazyInit:
+    @pytest.mark.parametrize(
+        "attr_name, init_method",
+        [
+            ("t2bsi", "_init_t2bsi_object"),
+            ("b2bsi", "_init_b2bsi_object"),
+            ("qdrant_engine", "_init_qdrant_backend"),
+        ],
+    )
+    def test_failed_init_is_not_retried(
+        self, config_obj, mocker, attr_name, init_method
+    ):
+        init_mock = mocker.patch.object(BedBaseConfig, init_method, return_value=None)
+
+        assert getattr(config_obj, attr_name) is None
+        assert getattr(config_obj, attr_name) is None
+        assert init_mock.call_count == 1
+
+    def test_init_on_first_access(self, config_obj, mocker):
+        t2bsi = object()
+        init_mock = mocker.patch.object(
+            BedBaseConfig, "_init_t2bsi_object", return_value=t2bsi
+        )
+        assert not init_mock.called
+
+        assert config_obj.t2bsi is t2bsi
+        assert config_obj.t2bsi is t2bsi
+        assert init_mock.call_count == 1
+
+
+def test_import_does_not_load_search_dependencies():
+    # fresh interpreter, so modules imported by other tests don't interfere
+    code = (
+        "import sys; import bbconf; "
+        "from bbconf.config_parser import BedBaseConfig; "
+        "print(sorted({'geniml', 'qdrant_client', 'torch'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+class TestParsedConfigCache:
+    def test_same_file_is_parsed_once(self, config_path):
+        BedBaseConfig._read_config_file(config_path)
+        BedBaseConfig._read_config_file(config_path)
+
+        cache_info = _parse_config_cached.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
+
+    def test_modified_file_is_parsed_again(self, config_path):
+        assert BedBaseConfig._read_config_file(config_path).database.host == "localhost"
+
+        with open(config_path) as f:
+            content = f.read()
+        with open(config_path, "w") as f:
+            f.write(content.replace("host: localhost", "host: db.example.org", 1))
+        _touch(config_path, os.stat(config_path).st_mtime_ns + 10**9)
+
+        config = BedBaseConfig._read_config_file(config_path)
+        assert config.database.host == "db.example.org"
+        assert _parse_config_cached.cache_info().misses == 2
+
+    def test_instances_get_independent_copies(self, config_path):
+        first_config = BedBaseConfig._read_config_file(config_path)
+        first_config.database.host = "changed"
+        first_config.access_methods.http.prefix = "changed"
+
+        second_config = BedBaseConfig._read_config_file(config_path)
+        assert second_config.database.host == "localhost"
+        assert second_config.access_methods.http.prefix == "https://data2.bedbase.org/"
+
+
+def test_env_variables_are_expanded(config_path, monkeypatch):
+    monkeypatch.setenv("BBCONF_TEST_PASSWORD", "secret")
+    with open(config_path) as f:
+        content = f.read()
+    content = content.replace("password: docker", "password: $BBCONF_TEST_PASSWORD")
+    content = content.replace(
+        "region2vec: databio/r2v-encode-hg38", "region2vec: ~/models/r2v"
+    )
+    with open(config_path, "w") as f:
+        f.write(content)
+
+    config = BedBaseConfig._read_config_file(config_path)
+    assert config.database.password == "secret"
+    assert config.path.region2vec == os.path.expanduser("~/models/r2v")
+
+    # expanded values are not written to the cache file
+    with open(config_path + CONFIG_CACHE_SUFFIX) as f:
+        cache_content = f.read()
+    assert "secret" not in cache_content
+    assert "$BBCONF_TEST_PASSWORD" in cache_content
+
+
+def test_env_variable_change_is_not_cached(config_path, monkeypatch):
+    with open(config_path) as f:
+        content = f.read()
+    with open(config_path, "w") as f:
+        f.write(content.replace("password: docker", "password: $BBCONF_TEST_PASSWORD"))
+
+    monkeypatch.setenv("BBCONF_TEST_PASSWORD", "first")
+    assert BedBaseConfig._read_config_file(config_path).database.password == "first"
+
+    monkeypatch.setenv("BBCONF_TEST_PASSWORD", "second")
+    assert BedBaseConfig._read_config_file(config_path).database.password == "second"
+    # file is loaded once, only expansion and validation are repeated
+    assert _load_config_cached.cache_info().misses == 1
+
+
+def test_delete_s3_batch(config_obj, mocker):
+    s3_client = mocker.Mock()
+    config_obj._boto3_client = s3_client
+    s3_paths = [f"files/a/b/{i}.bed.gz" for i in range(1500)]
+
+    s3_client.delete_objects.side_effect = [
+        # first batch: one key failed
+        {"Errors": [{"Key": s3_paths[3], "Code": "InternalError"}]},
+        # second batch: whole request failed
+        ClientError({"Error": {"Code": "NotImplemented"}}, "DeleteObjects"),
+    ]
+    config_obj.delete_s3_batch(s3_paths)
+
+    # keys are sent in chunks of 1000
+    batches = [
+        [obj["Key"] for obj in call.kwargs["Delete"]["Objects"]]
+        for call in s3_client.delete_objects.call_args_list
+    ]
+    assert batches == [s3_paths[:1000], s3_paths[1000:]]
+
+    # failed key and the whole failed batch are deleted one by one
+    deleted_one_by_one = [
+        call.kwargs["Key"] for call in s3_client.delete_object.call_args_list
+    ]
+    assert deleted_one_by_one == [s3_paths[3]] + s3_paths[1000:]
+
+
+def test_pickle_round_trip(config_obj, mocker):
+    boto3_client_mock = mocker.patch.object(
+        BedBaseConfig, "_init_boto3_client", return_value=None
+    )
+    t2bsi_mock = mocker.patch.object(
+        BedBaseConfig, "_init_t2bsi_object", return_value="t2bsi"
+    )
+    assert config_obj.t2bsi == "t2bsi"
+    config_obj.upload_executor
+
+    restored = pickle.loads(pickle.dumps(config_obj))
+
+    assert restored.config == config_obj.config
+    assert restored.cfg_path == config_obj.cfg_path
+    # clients are recreated
+    assert boto3_client_mock.call_count == 1
+    assert restored.phc is not None
+    assert restored.phc is not config_obj.phc
+    assert restored._lazy_init_lock is not config_obj._lazy_init_lock
+    assert restored.upload_executor is not config_obj.upload_executor
+    # lazy objects are created again on first use
+    assert restored.t2bsi == "t2bsi"
+    assert t2bsi_mock.call_count == 2
+
+
+def test_upload_executor_matches_transfer_concurrency(config_obj):
+    assert (
+        config_obj.upload_executor._max_workers == config_obj.config.s3.max_concurrency
+    )
+    assert config_obj.upload_executor is config_obj.upload_executor
@@ -0,0 +1,23 @@
+import threading
+
+from bbconf import db_utils
+from bbconf.db_utils import get_engine
+
+
+def test_engine_is_shared():
+    assert get_engine("sqlite://") is get_engine("sqlite://")
+
+
+def test_reset_engines_after_fork(monkeypatch):
+    # engines shared by other tests are not touched
+    monkeypatch.setattr(db_utils, "_ENGINES", {})
+    monkeypatch.setattr(db_utils, "_ENGINES_LOCK", threading.Lock())
+    engine = get_engine("sqlite://")
+
+    # another thread held the lock, while the process was forked
+    db_utils._ENGINES_LOCK.acquire()
+    db_utils._reset_engines_after_fork()
+    assert not db_utils._ENGINES_LOCK.locked()
+
+    # engines of the parent process are not reused
+    assert get_engine("sqlite://") is not engine
@@ -1,5 +1,8 @@
+from contextlib import contextmanager
 from typing import Union
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 from bbconf.config_parser.bedbaseconfig import BedBaseConfig
@@ -74,6 +77,26 @@ def get_plots() -> dict:
     }
 
 
+@contextmanager
+def count_queries(engine: Engine):
+    """
+    Count SQL statements executed by the engine inside the context
+
+    :param engine: sqlalchemy engine
+    :return: list, that is extended with every executed statement
+    """
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+
 class ContextManagerDBTesting:
     """
     Creates context manager to connect to database at db_url adds data and drop everything from the database upon exit to ensure